@@ -1,5 +1,7 @@
+import time
+
 import streamlit as st
-from main import InterviewAgent
+from main import InterviewAgent, _embeddings, _llm, run_sync
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Page configuration
@@ -15,12 +17,29 @@ st.set_page_config(
 # Load custom CSS
 # ────────────────────────────────────────────────────────────────────────────────
 
-def load_css(path: str):
+@st.cache_data
+def _read_css(path: str) -> str:
     with open(path) as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+        return f.read()
+
+def load_css(path: str):
+    st.markdown(f"<style>{_read_css(path)}</style>", unsafe_allow_html=True)
 
 load_css("styles.css")
 
+# ────────────────────────────────────────────────────────────────────────────────
+# Shared LLM client
+# ────────────────────────────────────────────────────────────────────────────────
+
+# Wrap main's factories so there is a single construction path for each
+# client; Streamlit's resource cache keeps them across sessions and reruns.
+_get_llm = st.cache_resource(_llm)
+_get_embeddings = st.cache_resource(_embeddings)
+
+def new_interview_agent() -> InterviewAgent:
+    """Create fresh per-session interview state around the shared clients."""
+    return InterviewAgent(llm=_get_llm("gpt-4.1", 0.7), embeddings=_get_embeddings())
+
 # ────────────────────────────────────────────────────────────────────────────────
 # Session‑state & UI helpers
 # ────────────────────────────────────────────────────────────────────────────────
@@ -28,7 +47,7 @@ if "messages" not in st.session_state:
     st.session_state.messages = []  # list[dict]
 
 if "interview_agent" not in st.session_state:
-    st.session_state.interview_agent = InterviewAgent()
+    st.session_state.interview_agent = new_interview_agent()
 
 if "interview_started" not in st.session_state:
     st.session_state.interview_started = False
@@ -36,44 +55,72 @@ if "interview_started" not in st.session_state:
 st.markdown("## 💼 **Interview Chat**")
 
 def display_message(message: dict):
-    """Render a chat bubble based on role."""
-    bubble_class = "user" if message["role"] == "user" else "assistant"
-    st.markdown(
-        f'<div class="chat-bubble {bubble_class}">{message["content"]}</div>',
-        unsafe_allow_html=True,
-    )
+    """Render a chat message based on role."""
+    with st.chat_message(message["role"]):
+        st.markdown(message["content"])
+
+def iter_async(agen):
+    """Drive an async generator from Streamlit's synchronous script thread."""
+    try:
+        while True:
+            try:
+                yield run_sync(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        run_sync(agen.aclose())
+
+# Minimum seconds between redraws while streaming (~20 updates per second)
+STREAM_FLUSH_INTERVAL = 0.05
+
+def stream_reply(tokens) -> str:
+    """Render tokens into a single assistant message as they arrive."""
+    with st.chat_message("assistant"):
+        placeholder = st.empty()
+        reply = ""
+        last_flush = 0.0
+        for token in tokens:
+            reply += token
+            now = time.monotonic()
+            if now - last_flush > STREAM_FLUSH_INTERVAL:
+                placeholder.markdown(reply)
+                last_flush = now
+        # Always render the complete reply once the stream ends
+        placeholder.markdown(reply)
+    return reply
 
 # Start interview if not already started
 if not st.session_state.interview_started:
     with st.spinner("Starting interview..."):
         # Get the first question from the interview agent
-        first_question = st.session_state.interview_agent.get_response([])
+        first_question = run_sync(st.session_state.interview_agent.aget_response([]))
         st.session_state.messages.append({"role": "assistant", "content": first_question})
         st.session_state.interview_started = True
 
-# Render chat history
-for msg in st.session_state.messages:
-    display_message(msg)
-
 # ────────────────────────────────────────────────────────────────────────────────
-# Chat input ↔ LLM
+# Chat history & input ↔ LLM
 # ────────────────────────────────────────────────────────────────────────────────
-user_prompt = st.chat_input("Type your response and press Enter…")
 
-if user_prompt:
-    # Add user message & show instantly
-    st.session_state.messages.append({"role": "user", "content": user_prompt})
-    display_message(st.session_state.messages[-1])
+@st.fragment
+def interview_chat():
+    """Chat history and input; reruns on its own when the candidate replies."""
+    for msg in st.session_state.messages:
+        display_message(msg)
+
+    user_prompt = st.chat_input("Type your response and press Enter…")
 
-    with st.spinner("Interviewer is thinking…"):
-        # Get response from interview agent
-        assistant_reply = st.session_state.interview_agent.get_response(st.session_state.messages[:])
+    if user_prompt:
+        # Add user message & show instantly
+        st.session_state.messages.append({"role": "user", "content": user_prompt})
+        display_message(st.session_state.messages[-1])
 
-    st.session_state.messages.append({"role": "assistant", "content": assistant_reply})
-    display_message(st.session_state.messages[-1])
+        # Stream the interviewer's reply as it is generated
+        assistant_reply = stream_reply(
+            iter_async(st.session_state.interview_agent.astream_response(st.session_state.messages))
+        )
+        st.session_state.messages.append({"role": "assistant", "content": assistant_reply})
 
-    # Auto‑scroll to newest message
-    st.markdown("""<script>window.scrollTo(0, document.body.scrollHeight);</script>""", unsafe_allow_html=True)
+interview_chat()
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Sidebar
@@ -98,6 +145,6 @@ with st.sidebar.expander("⚙️ Settings & Info", expanded=False):
 
     if st.button("🔄 Reset Interview"):
         st.session_state.messages = []
-        st.session_state.interview_agent = InterviewAgent()
+        st.session_state.interview_agent = new_interview_agent()
         st.session_state.interview_started = False
         st.rerun()
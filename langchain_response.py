@@ -1,8 +1,8 @@
-from pydantic import BaseModel
+from typing import Optional
 
+from pydantic import BaseModel, Field
 
-class InterviewResponse(BaseModel):
-    topic: str
-    summary: str
-    sources: str
-    tools_used: str
+
+class FollowupDecision(BaseModel):
+    needs_followup: bool = Field(description="Whether the candidate's response needs a follow-up question")
+    question: Optional[str] = Field(default=None, description="The follow-up question to ask, if one is needed")
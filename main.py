@@ -1,155 +1,480 @@
+import asyncio
+import functools
+import hashlib
+import re
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
 from dotenv import load_dotenv
-from typing import List, Optional, Dict
+from typing import AsyncIterator, List, Optional, Dict, Tuple
+
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 
-from langchain.chat_models import ChatOpenAI
-from langchain.memory import ConversationBufferMemory
-from langchain.schema import HumanMessage, SystemMessage
+from langchain_response import FollowupDecision
 
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-QUESTIONS: List[str] = [
+# Exact-match cache for identical prompts sent to the LLM, bounded so a
+# long-running server doesn't accumulate every prompt it has ever sent
+LLM_CACHE_MAX_ENTRIES = 1024
+set_llm_cache(InMemoryCache(maxsize=LLM_CACHE_MAX_ENTRIES))
+
+# Hard cap on how many recent messages are sent as follow-up context, so the
+# prompt size stays bounded no matter how long the interview runs.
+MAX_HISTORY_MESSAGES = 6
+
+# System prompt for deciding on and writing a follow-up in a single call
+FOLLOWUP_DECISION_PROMPT = (
+    "You are an experienced interviewer evaluating a candidate's latest response. "
+    "Decide whether it needs a follow-up question. "
+    "A follow-up is needed if the response:\n"
+    "1. Lacks specific examples or concrete details\n"
+    "2. Is too brief or vague (under 30 words)\n"
+    "3. Doesn't explain the candidate's role or actions clearly\n"
+    "4. Missing the outcome or impact of their actions\n"
+    "5. Doesn't address the STAR method (Situation, Task, Action, Result)\n\n"
+    "If a follow-up is needed, also write ONE specific follow-up question about what's missing. "
+    "Keep it conversational and under 25 words. Be direct and specific."
+)
+
+# System prompt for generating follow-up questions
+FOLLOWUP_GENERATION_PROMPT = (
+    "You are an experienced interviewer. Generate ONE specific follow-up question "
+    "based on what's missing from the candidate's response. Focus on:\n"
+    "1. Getting specific examples if response is vague\n"
+    "2. Understanding their role and actions if unclear\n"
+    "3. Learning about results/outcomes if missing\n"
+    "4. Probing decision-making process if needed\n"
+    "Keep it conversational and under 25 words. Be direct and specific."
+)
+
+# Fallbacks when the LLM returns no question or the call fails
+DEFAULT_FOLLOWUP = "Can you give me a specific example?"
+ERROR_FOLLOWUP = "Could you elaborate on that with more details?"
+
+# Returned by InterviewAgent._a_plan_followup when a follow-up is certainly
+# needed but its text has not been written yet
+_WRITE_FOLLOWUP = object()
+
+COMPLETION_MESSAGE = "Thank you for your time! We'll be in touch."
+
+QUESTIONS: Tuple[str, ...] = (
     "Tell me about yourself.",
     "Why are you interested in this role?",
     "Describe a time you overcame a challenge.",
     "What is your greatest strength?",
     "What questions do you have for us?",
-]
+)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="interview-agent-loop", daemon=True).start()
+    return _loop
+
+
+def run_sync(coro):
+    """Run a coroutine on the shared background event loop and wait for its result.
+
+    All agents await their LLM calls on this one loop, so concurrent interviews
+    overlap their network waits and the shared async clients always stay on the
+    loop that owns their connections.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+@functools.lru_cache(maxsize=4)
+def _llm(model_name: str, temperature: float) -> ChatOpenAI:
+    """Shared chat client per model/temperature so agents reuse one connection pool."""
+    return ChatOpenAI(model_name=model_name, temperature=temperature)
+
+
+@functools.lru_cache(maxsize=1)
+def _embeddings() -> OpenAIEmbeddings:
+    return OpenAIEmbeddings()
+
+
+def _unit_vector(embedding: List[float]) -> Optional[np.ndarray]:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else None
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _answer_key(question: str, answer: str) -> Tuple[bytes, bytes]:
+    return _digest(question), _digest(answer)
+
+
+class SemanticFollowupCache:
+    """Reuse follow-up decisions for identical or near-identical answers to the same prepared question.
+
+    Decisions are keyed on the answer alone. Generated questions depend on the
+    whole recent transcript, so they are cached separately and only reused for
+    an identical one.
+    """
+
+    def __init__(self, threshold: float = 0.93, max_entries: int = 512, max_exact_entries: int = 1024) -> None:
+        self.threshold = threshold
+        # Ring buffer of unit-length embeddings, so similarity is a single
+        # matrix-vector product; allocated on first store once the dimension is known
+        self._vectors: Optional[np.ndarray] = None
+        self._question_keys = np.empty(max_entries, dtype=object)
+        self._decisions: List[bool] = [False] * max_entries
+        self._max_entries = max_entries
+        self._size = 0
+        self._next = 0
+        self._exact: OrderedDict = OrderedDict()  # (question digest, answer digest) -> needs_followup
+        self._questions: OrderedDict = OrderedDict()  # transcript digest -> generated question
+        self._max_exact_entries = max_exact_entries
+        self._lock = threading.Lock()
+
+    def lookup_exact(self, answer: str, question: str) -> Optional[bool]:
+        """Return the decision for an answer seen verbatim before, or None; needs no embedding."""
+        key = _answer_key(question, answer)
+        with self._lock:
+            if key not in self._exact:
+                return None
+            self._exact.move_to_end(key)
+            return self._exact[key]
+
+    def lookup(self, embedding: List[float], question: str) -> Optional[bool]:
+        """Return the decision for the most similar cached answer, or None on a miss."""
+        query = _unit_vector(embedding)
+        question_key = _digest(question)
+        with self._lock:
+            if query is None or not self._size or query.shape[0] != self._vectors.shape[1]:
+                return None
+            scores = self._vectors[:self._size] @ query
+            scores[self._question_keys[:self._size] != question_key] = -1.0
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return self._decisions[best]
+        return None
+
+    def store(self, answer: str, embedding: Optional[List[float]], question: str, needs_followup: bool) -> None:
+        key = _answer_key(question, answer)
+        vector = _unit_vector(embedding) if embedding is not None else None
+        with self._lock:
+            self._put(self._exact, key, needs_followup)
+            if vector is None:
+                return
+            if self._vectors is None:
+                self._vectors = np.empty((self._max_entries, vector.shape[0]), dtype=np.float32)
+            elif vector.shape[0] != self._vectors.shape[1]:
+                return
+            self._vectors[self._next] = vector
+            self._question_keys[self._next] = key[0]
+            self._decisions[self._next] = needs_followup
+            self._next = (self._next + 1) % self._max_entries
+            self._size = min(self._size + 1, self._max_entries)
+
+    def lookup_question(self, transcript: str) -> Optional[str]:
+        """Return the follow-up generated before for this exact transcript, or None."""
+        key = _digest(transcript)
+        with self._lock:
+            question = self._questions.get(key)
+            if question is not None:
+                self._questions.move_to_end(key)
+            return question
+
+    def store_question(self, transcript: str, question: str) -> None:
+        with self._lock:
+            self._put(self._questions, _digest(transcript), question)
+
+    def _put(self, entries: OrderedDict, key, value) -> None:
+        """Insert into an LRU layer; the caller holds the lock."""
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self._max_exact_entries:
+            entries.popitem(last=False)
+
+
+# Shared across agents so that every session benefits from earlier answers
+followup_cache = SemanticFollowupCache()
+
 
 class InterviewAgent:
     """Unified interview agent that orchestrates the interview process and integrates with Streamlit."""
 
+    # Signals of a concrete, STAR-style answer (causality, actions, results, numbers)
+    _STAR_RE = re.compile(r"\b(when|because|so|result|led|built|designed|increased|reduced)\b|%|\d+", re.I)
+
     def __init__(
         self,
         questions: List[str] = None,
         max_followups_per_question: int = 2,
         model_name: str = "gpt-4.1",
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        llm: Optional[ChatOpenAI] = None,
+        embeddings: Optional[OpenAIEmbeddings] = None,
+        followup_min_words: int = 8,
+        followup_max_words: int = 80
     ) -> None:
         if max_followups_per_question < 0:
             raise ValueError("max_followups_per_question must be non-negative")
+        if followup_min_words > followup_max_words:
+            raise ValueError("followup_min_words must not exceed followup_max_words")
 
-        self.questions = questions or QUESTIONS
+        self.questions = tuple(questions or QUESTIONS)  # private copy; callers can't mutate it
+        self._num_questions = len(self.questions)
         self.max_followups_per_question = max_followups_per_question
-        self.llm = ChatOpenAI(model_name=model_name, temperature=temperature)
+        # Answers shorter than min always get a follow-up; detailed answers longer
+        # than max never do. Only the band in between is sent to the LLM.
+        self.followup_min_words = followup_min_words
+        self.followup_max_words = followup_max_words
+        # Reuse an injected or module-level client so that new agents (and
+        # interview resets) don't rebuild the HTTP client.
+        self.llm = llm or _llm(model_name, temperature)
+        self.embeddings = embeddings or _embeddings()
+        self.followup_decider = self.llm.with_structured_output(FollowupDecision)
 
         # runtime state
         self.q_index = 0          
         self.current_question_followups = 0  # Track follow-ups for current question
         self.is_started = False
+        # Recent transcript lines, formatted once as they are added
+        self._recent: deque = deque(maxlen=MAX_HISTORY_MESSAGES)
 
-        # System prompt for evaluating response quality
-        self.evaluation_system_prompt = (
-            "You are an experienced interviewer evaluating a candidate's response. "
-            "Analyze the response and determine if it needs a follow-up question. "
-            "A follow-up is needed if the response:\n"
-            "1. Lacks specific examples or concrete details\n"
-            "2. Is too brief or vague (under 30 words)\n"
-            "3. Doesn't explain the candidate's role or actions clearly\n"
-            "4. Missing the outcome or impact of their actions\n"
-            "5. Doesn't address the STAR method (Situation, Task, Action, Result)\n\n"
-            "Respond with only 'YES' if a follow-up is needed, or 'NO' if the response is adequate."
-        )
-        
-        # System prompt for generating follow-up questions
-        self.followup_generation_prompt = (
-            "You are an experienced interviewer. Generate ONE specific follow-up question "
-            "based on what's missing from the candidate's response. Focus on:\n"
-            "1. Getting specific examples if response is vague\n"
-            "2. Understanding their role and actions if unclear\n"
-            "3. Learning about results/outcomes if missing\n"
-            "4. Probing decision-making process if needed\n"
-            "Keep it conversational and under 25 words. Be direct and specific."
+        # Static interview context shared by both system prompts. Everything that
+        # varies per turn goes in the trailing human message so the system
+        # prefix stays identical for the provider's prompt caching.
+        interview_context = "\n\nThe prepared interview questions, in order, are:\n" + "\n".join(
+            f"{i}. {q}" for i, q in enumerate(self.questions, 1)
         )
+
+        self.followup_decision_prompt = FOLLOWUP_DECISION_PROMPT + interview_context
+        self.followup_generation_prompt = FOLLOWUP_GENERATION_PROMPT + interview_context
+
+        # Built once so every call sends the exact same prefix
+        self._decision_sys_msg = SystemMessage(content=self.followup_decision_prompt)
+        self._followup_sys_msg = SystemMessage(content=self.followup_generation_prompt)
         
-        logger.info(f"InterviewAgent initialized with {len(self.questions)} questions, max_followups_per_question={max_followups_per_question}")
+        logger.debug("InterviewAgent initialized with %d questions, max_followups_per_question=%d", self._num_questions, max_followups_per_question)
 
     def _next_prepared_question(self) -> Optional[str]:
-        if self.q_index < len(self.questions):
+        if self.q_index < self._num_questions:
             q = self.questions[self.q_index]
-            logger.info(f"Retrieving prepared question {self.q_index + 1}/{len(self.questions)}: '{q}'")
+            logger.debug("Retrieving prepared question %d/%d: %r", self.q_index + 1, self._num_questions, q)
             self.q_index += 1
             self.current_question_followups = 0  # Reset follow-up counter for new question
             return q
-        logger.info("No more prepared questions available")
+        logger.debug("No more prepared questions available")
         return None
 
-    def _should_ask_followup(self, candidate_response: str) -> bool:
-        """Evaluate if a follow-up question is needed based on response quality."""
-        logger.info(f"Evaluating response quality for follow-up decision")
-        
-        # Basic checks first
-        if len(candidate_response.strip()) < 20:
-            logger.info("Response too short, follow-up needed")
+    def _current_question(self) -> str:
+        """The prepared question the candidate is currently answering."""
+        return self.questions[self.q_index - 1]
+
+    def _heuristic_needs_followup(self, candidate_response: str) -> Optional[bool]:
+        """Decide obvious cases without the LLM; returns None when the answer is ambiguous."""
+        word_count = len(candidate_response.split())
+        if word_count < self.followup_min_words:
+            logger.debug("Heuristic decision: response too short (%d words), follow-up needed", word_count)
             return True
-            
+        if word_count > self.followup_max_words and len(self._STAR_RE.findall(candidate_response)) >= 2:
+            logger.debug("Heuristic decision: detailed response (%d words), no follow-up needed", word_count)
+            return False
+        return None
+
+    def _record_candidate_reply(self, conversation_history: Optional[List[dict]]) -> None:
+        if conversation_history and conversation_history[-1]["role"] == "user":
+            self._recent.append(f"Candidate: {conversation_history[-1]['content']}")
+
+    def _record_interviewer_line(self, line: str) -> None:
+        self._recent.append(f"Interviewer: {line}")
+
+    def _format_history(self) -> str:
+        """Return the recent conversation as a readable transcript."""
+        return "\n".join(self._recent) + "\n"
+
+    def _followup_transcript(self) -> str:
+        """Everything a generated follow-up depends on: its system prompt and the recent conversation."""
+        return f"{self.followup_generation_prompt}\n{self._format_history()}"
+
+    def _build_followup_messages(self) -> list:
+        """Build the prompt used to generate a follow-up question."""
+        return [self._followup_sys_msg, HumanMessage(content=f"Recent conversation:\n{self._format_history()}")]
+
+    def _build_decision_messages(self) -> list:
+        """Build the prompt used to decide on and write a follow-up in one call."""
+        return [self._decision_sys_msg, HumanMessage(content=f"Recent conversation:\n{self._format_history()}")]
+
+    async def _a_decide_followup(self) -> Optional[str]:
+        """Decide whether a follow-up is needed and write it, in one structured LLM call.
+
+        LLM errors propagate so the caller can tell a failed call from a real decision.
+        """
+        logger.debug("Evaluating response quality for follow-up decision")
+
+        decision = await self.followup_decider.ainvoke(self._build_decision_messages())
+        logger.debug("LLM follow-up decision: %r", decision)
+
+        if not decision.needs_followup:
+            return None
+        question = (decision.question or "").strip()
+        if not question:
+            logger.warning("LLM requested a follow-up without a question, using fallback")
+            return DEFAULT_FOLLOWUP
+        return question
+
+    async def _a_generate_followup_question(self) -> str:
+        """Generate a specific follow-up question based on the recent conversation."""
+        logger.debug("Generating follow-up question")
+
+        transcript = self._followup_transcript()
+        cached = followup_cache.lookup_question(transcript)
+        if cached is not None:
+            logger.debug("Cache hit for follow-up question: %r", cached)
+            return cached
+
         try:
-            messages = [
-                SystemMessage(content=self.evaluation_system_prompt),
-                HumanMessage(content=f"Candidate's response: {candidate_response}")
-            ]
-            
-            response = self.llm(messages)
-            decision = response.content.strip().upper()
-            
-            logger.info(f"LLM evaluation decision: {decision}")
-            return decision == "YES"
-            
+            response = await self.llm.ainvoke(self._build_followup_messages())
+            question = response.content.strip()
+            if not question:
+                logger.warning("LLM returned empty follow-up, using fallback")
+                return DEFAULT_FOLLOWUP
+
         except Exception as e:
-            logger.error(f"Error in response evaluation: {e}")
-            # Default to asking follow-up if evaluation fails
-            return True
+            logger.error("Error generating follow-up: %s", e)
+            return ERROR_FOLLOWUP
 
-    def _generate_followup_question(self, conversation_history: List[dict]) -> str:
-        """Generate a specific follow-up question based on conversation history."""
-        logger.info("Generating follow-up question")
-        
-        # Convert conversation history to a readable format
-        history_text = ""
-        for msg in conversation_history[-4:]:  # Only use last 4 messages for context
-            role = "Interviewer" if msg["role"] == "assistant" else "Candidate"
-            history_text += f"{role}: {msg['content']}\n"
-        
+        followup_cache.store_question(transcript, question)
+        return question
+
+    async def astream_followup(self) -> AsyncIterator[str]:
+        """Stream a follow-up question token by token.
+
+        Shares the question cache with :meth:`_a_generate_followup_question`
+        (a hit is yielded as one chunk) and falls back like it when the stream
+        fails or produces nothing.
+        """
+        logger.debug("Streaming follow-up question")
+
+        transcript = self._followup_transcript()
+        cached = followup_cache.lookup_question(transcript)
+        if cached is not None:
+            logger.debug("Cache hit for follow-up question: %r", cached)
+            yield cached
+            return
+
+        streamed = ""
         try:
-            messages = [
-                SystemMessage(content=self.followup_generation_prompt),
-                HumanMessage(content=f"Recent conversation:\n{history_text}\n\nWhat follow-up question should I ask?")
-            ]
-            
-            response = self.llm(messages)
-            followup = response.content.strip()
-            
-            if followup:
-                logger.info(f"Generated follow-up question: '{followup}'")
-                return followup
-            else:
-                logger.warning("LLM returned empty follow-up, using fallback")
-                return "Can you give me a specific example?"
-                
+            async for chunk in self.llm.astream(self._build_followup_messages()):
+                if chunk.content:
+                    streamed += chunk.content
+                    yield chunk.content
         except Exception as e:
-            logger.error(f"Error generating follow-up: {e}")
-            return "Could you elaborate on that with more details?"
+            logger.error("Error streaming follow-up: %s", e)
+            if not streamed.strip():
+                yield ERROR_FOLLOWUP
+            return
 
-    def _generate_followup(self, conversation_history: List[dict]) -> Optional[str]:
-        """Use a two-step process to decide and generate follow-up questions."""
-            
-        last_user_msg = conversation_history[-1]['content']
-                
-        if self._should_ask_followup(last_user_msg):
-            return self._generate_followup_question(conversation_history)
-        else:
-            logger.info("Response evaluation determined no follow-up needed")
+        if not streamed.strip():
+            logger.warning("LLM returned empty follow-up, using fallback")
+            yield DEFAULT_FOLLOWUP
+            return
+        followup_cache.store_question(transcript, streamed.strip())
+
+    async def _a_lookup_similar_followup(self, candidate_response: str, question: str) -> Tuple[Optional[List[float]], Optional[bool]]:
+        """Look the response up in the follow-up cache by embedding.
+
+        Returns:
+            ``(embedding, needs_followup)``; ``embedding`` is None if embedding
+            failed, ``needs_followup`` is None on a cache miss.
+        """
+        try:
+            embedding = await self.embeddings.aembed_query(candidate_response)
+        except Exception as e:
+            logger.error("Error embedding response for follow-up cache: %s", e)
+            return None, None
+
+        cached = followup_cache.lookup(embedding, question)
+        if cached is not None:
+            logger.debug("Semantic cache hit for follow-up decision: %r", cached)
+        return embedding, cached
+
+    async def _a_plan_followup(self, conversation_history: Optional[List[dict]]):
+        """Decide how to follow up on the candidate's latest reply.
+
+        Obvious cases are settled by heuristics and cached decisions; when the
+        decision is still open it is made together with the question in one call.
+
+        Returns:
+            None when the interview should move on, the follow-up question when the
+            decision call already wrote it, or ``_WRITE_FOLLOWUP`` when a follow-up
+            is certainly needed and still has to be generated.
+        """
+        if not conversation_history or self.current_question_followups >= self.max_followups_per_question:
             return None
 
-    def agent_turn(self, conversation_history: List[dict] = None) -> str:
+        last_user_msg = conversation_history[-1]['content']
+
+        needs_followup = self._heuristic_needs_followup(last_user_msg)
+        if needs_followup is None:
+            return await self._a_cached_decide_followup(last_user_msg)
+        return _WRITE_FOLLOWUP if needs_followup else None
+
+    async def _a_cached_decide_followup(self, candidate_response: str):
+        """Decide on a follow-up, using a cached decision for this answer when there is one.
+
+        A verbatim hit is checked first and skips the LLM entirely. Otherwise the
+        decision call is started speculatively alongside the embedding lookup so
+        a miss costs one round-trip instead of two. The request is already sent
+        by the time a similar answer is found, so a semantic hit saves latency
+        but not the call. A cached "yes" returns ``_WRITE_FOLLOWUP`` so the
+        question is written (or streamed) straight away.
+        """
+        question = self._current_question()
+        cached = followup_cache.lookup_exact(candidate_response, question)
+        if cached is not None:
+            logger.debug("Exact cache hit for follow-up decision: %r", cached)
+            return _WRITE_FOLLOWUP if cached else None
+
+        llm_task = asyncio.create_task(self._a_decide_followup())
+        embedding, cached = await self._a_lookup_similar_followup(candidate_response, question)
+        if cached is not None:
+            if not llm_task.cancel():
+                llm_task.exception()  # already finished; don't leave an error unretrieved
+            return _WRITE_FOLLOWUP if cached else None
+
+        try:
+            followup = await llm_task
+        except Exception as e:
+            logger.error("Error deciding on follow-up: %s", e)
+            # Default to asking a follow-up, but keep the failure out of the shared cache
+            return ERROR_FOLLOWUP
+        followup_cache.store(candidate_response, embedding, question, followup is not None)
+        return followup
+
+    def _next_interviewer_line(self) -> str:
+        """Return the next prepared question, or the closing line once they run out."""
+        prepared = self._next_prepared_question()
+        if prepared is not None:
+            logger.debug("Prepared question asked: %r", prepared)
+            return prepared
+
+        # If no more questions, close the interview
+        logger.debug("Interview completed with closing message: %r", COMPLETION_MESSAGE)
+        return COMPLETION_MESSAGE
+
+    async def aagent_turn(self, conversation_history: List[dict] = None) -> str:
         """Advance the interview by one line.
 
         Args:
@@ -157,33 +482,29 @@ class InterviewAgent:
         Returns:
             The next interviewer line.
         """
-        logger.info(f"Agent turn started - current_question_followups: {self.current_question_followups}, max_per_question: {self.max_followups_per_question}")
-        
+        self._record_candidate_reply(conversation_history)
+        line = await self._a_turn(conversation_history)
+        self._record_interviewer_line(line)
+        return line
 
-        # Check if we should consider a follow-up (only if we have remaining follow-ups for current question)
-        if conversation_history and self.current_question_followups < self.max_followups_per_question:
-            logger.info("Checking if follow-up is needed")
-            # Use conversation history from app if available
-            follow = self._generate_followup(conversation_history)
-            if follow:  # LLM decided to ask a follow-up
-                self.current_question_followups += 1
-                logger.info(f"Follow-up question generated: '{follow}' (current question followups: {self.current_question_followups})")
-                return follow
-            else:
-                logger.info("LLM decided no follow-up needed, moving to next prepared question")
-
-        # If no follow-up needed or max follow-ups reached, move to next prepared question
-        prepared = self._next_prepared_question()
-        if prepared is not None:
-            logger.info(f"Prepared question asked: '{prepared}'")
-            return prepared
+    async def _a_turn(self, conversation_history: Optional[List[dict]]) -> str:
+        logger.debug("Agent turn started - current_question_followups: %d, max_per_question: %d", self.current_question_followups, self.max_followups_per_question)
 
-        # If no more questions, close the interview
-        closing = "Thank you for your time! We'll be in touch."
-        logger.info(f"Interview completed with closing message: '{closing}'")
-        return closing
+        plan = await self._a_plan_followup(conversation_history)
+        if plan is None:
+            logger.debug("No follow-up needed, moving to next prepared question")
+            return self._next_interviewer_line()
 
-    def get_response(self, conversation_history: List[dict]) -> str:
+        followup = await self._a_generate_followup_question() if plan is _WRITE_FOLLOWUP else plan
+        self.current_question_followups += 1
+        logger.debug("Follow-up question asked: %r (current question followups: %d)", followup, self.current_question_followups)
+        return followup
+
+    def agent_turn(self, conversation_history: List[dict] = None) -> str:
+        """Blocking wrapper around :meth:`aagent_turn`."""
+        return run_sync(self.aagent_turn(conversation_history))
+
+    async def aget_response(self, conversation_history: List[dict]) -> str:
         """
         Get response from the interview agent.
         
@@ -194,18 +515,56 @@ class InterviewAgent:
         Returns:
             Agent's response
         """
-        logger.info(f"conversation_history: {conversation_history[:5]}")
-        
         # If this is the first interaction, start the interview
         if not self.is_started:
             self.is_started = True
-            return self.agent_turn()
+            return await self.aagent_turn()
         
         # Continue the interview with user input and conversation history
-        return self.agent_turn(conversation_history)
+        return await self.aagent_turn(conversation_history)
+
+    def get_response(self, conversation_history: List[dict]) -> str:
+        """Blocking wrapper around :meth:`aget_response`."""
+        return run_sync(self.aget_response(conversation_history))
+
+    async def astream_response(self, conversation_history: List[dict]) -> AsyncIterator[str]:
+        """Streaming counterpart of :meth:`aget_response`.
+
+        LLM-generated follow-ups are yielded token by token; prepared questions,
+        cached follow-ups and the closing line are yielded as a single chunk.
+        """
+        self._record_candidate_reply(conversation_history)
+        chunks = []
+        async for token in self._astream_turn(conversation_history):
+            chunks.append(token)
+            yield token
+        self._record_interviewer_line("".join(chunks).strip())
+
+    async def _astream_turn(self, conversation_history: List[dict]) -> AsyncIterator[str]:
+        if not self.is_started:
+            self.is_started = True
+            yield self._next_interviewer_line()
+            return
+
+        plan = await self._a_plan_followup(conversation_history)
+        if plan is None:
+            yield self._next_interviewer_line()
+            return
+
+        self.current_question_followups += 1
+        if plan is _WRITE_FOLLOWUP:
+            async for token in self.astream_followup():
+                yield token
+        else:
+            yield plan
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
     interview = InterviewAgent(max_followups_per_question=2)
 
     print("Agent:", interview.agent_turn())  
@@ -215,11 +574,11 @@ if __name__ == "__main__":
         # Build conversation history for follow-up generation
         conversation_history.append({"role": "user", "content": user_input})
         
-        reply = interview.agent_turn(user_input, conversation_history)
+        reply = interview.agent_turn(conversation_history)
         print("Agent:", reply)
         
         # Update conversation history
         conversation_history.append({"role": "assistant", "content": reply})
         
-        if reply.startswith("Thank you"):
+        if reply == COMPLETION_MESSAGE:
             break
\ No newline at end of file
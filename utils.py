@@ -1,31 +1,422 @@
 """Utility functions for AI chat back‑end."""
 
+import asyncio
+import functools
+import io
+import json
 import os
+import weakref
+from collections import defaultdict
+from collections.abc import Iterator
+from typing import Literal, TypedDict
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
 
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+MODEL = "gpt-4o-mini"
+
+# Decided once at import: setting OPENAI_API_KEY later requires reloading this module
+_PROVIDER = "openai" if OPENAI_AVAILABLE and os.getenv("OPENAI_API_KEY") else "demo"
+
+
+class Message(TypedDict):
+    role: Literal["user", "assistant", "system"]
+    content: str
+
 
-def get_ai_response(history: list[dict], prompt: str) -> str:
+def _with_prompt(history: list[Message], prompt: str) -> list[Message]:
+    """Return the request messages: ``history`` followed by the new user prompt."""
+    messages = list(history)
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+# One shared client so its HTTP connection pool is reused across calls; None in demo mode
+_CLIENT = OpenAI() if _PROVIDER == "openai" else None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+
+def _get_async_client() -> "AsyncOpenAI":
+    """Return the AsyncOpenAI client for the running event loop.
+
+    Async connection pools belong to the loop that opened them, so each loop
+    gets its own client, which is then reused for every call made on it.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncOpenAI()
+    return client
+
+
+def get_ai_response(history: list[Message], prompt: str) -> str:
     """Return assistant response given conversation history and the latest user prompt.
 
     Parameters
     ----------
-    history : list[dict]
+    history : list[Message]
         Previous messages excluding the new prompt, each like {"role": "user"|"assistant", "content": "..."}
     prompt : str
         New user message
     """
     # Demo fallback when SDK not installed or API key missing
-    if not OPENAI_AVAILABLE or not os.getenv("OPENAI_API_KEY"):
+    if _CLIENT is None:
         return f"(demo) Echo: {prompt}"
 
-    client = OpenAI()
-    chat_completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=history + [{"role": "user", "content": prompt}],
+    chat_completion = _CLIENT.chat.completions.create(
+        model=MODEL,
+        messages=_with_prompt(history, prompt),
     )
     return chat_completion.choices[0].message.content
+
+
+def stream_ai_response(history: list[Message], prompt: str) -> Iterator[str]:
+    """Yield the assistant response in chunks as they are generated.
+
+    Takes the same arguments as :func:`get_ai_response`; use it to show the
+    first tokens without waiting for the whole completion.
+    """
+    if _CLIENT is None:
+        yield f"(demo) Echo: {prompt}"
+        return
+
+    stream = _CLIENT.chat.completions.create(
+        model=MODEL,
+        messages=_with_prompt(history, prompt),
+        stream=True,
+    )
+    for chunk in stream:
+        if chunk.choices:
+            yield chunk.choices[0].delta.content or ""
+
+
+async def aget_ai_response(history: list[Message], prompt: str) -> str:
+    """Async version of :func:`get_ai_response`.
+
+    Awaiting the request lets concurrent conversations overlap their network
+    waits instead of blocking one another. Requests are sent through the
+    running loop's shared :class:`BatchedLLMClient`.
+    """
+    if _CLIENT is None:
+        return f"(demo) Echo: {prompt}"
+
+    return await _get_batcher().submit(history, prompt)
+
+
+async def _acreate_response(history: list[Message], prompt: str) -> str:
+    """Send one chat completion request with the running loop's async client."""
+    client = _get_async_client()
+    chat_completion = await client.chat.completions.create(
+        model=MODEL,
+        messages=_with_prompt(history, prompt),
+    )
+    return chat_completion.choices[0].message.content
+
+
+async def batch_get_ai_responses(
+    items: list[tuple[list[Message], str]], max_concurrency: int = 10
+) -> list[str]:
+    """Return responses for many ``(history, prompt)`` pairs, fetched concurrently.
+
+    Parameters
+    ----------
+    items : list[tuple[list[Message], str]]
+        Conversations to answer, each as ``(history, prompt)`` like :func:`get_ai_response` takes
+    max_concurrency : int
+        Maximum number of requests in flight at once
+
+    Returns
+    -------
+    list[str]
+        Responses in the same order as ``items``
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _one(history: list[Message], prompt: str) -> str:
+        async with semaphore:
+            return await aget_ai_response(history, prompt)
+
+    return await asyncio.gather(*(_one(history, prompt) for history, prompt in items))
+
+
+def batch_get_ai_responses_sync(
+    items: list[tuple[list[Message], str]], max_concurrency: int = 10
+) -> list[str]:
+    """Blocking wrapper around :func:`batch_get_ai_responses` for synchronous callers."""
+
+    async def _run() -> list[str]:
+        try:
+            return await batch_get_ai_responses(items, max_concurrency)
+        finally:
+            # asyncio.run() makes a fresh loop each call, so close the batcher
+            # and client opened on it rather than leaking one connection pool per call
+            loop = asyncio.get_running_loop()
+            batcher = _batchers.pop(loop, None)
+            if batcher is not None:
+                await batcher.close()
+            client = _async_clients.pop(loop, None)
+            if client is not None:
+                await client.close()
+
+    return asyncio.run(_run())
+
+
+_BATCH_ENDPOINT = "/v1/chat/completions"
+_BATCH_FAILED_STATUSES = {"failed", "expired", "cancelled"}
+
+
+def submit_batch(items: list[tuple[list[Message], str]]) -> str:
+    """Submit many ``(history, prompt)`` pairs as one OpenAI Batch API job.
+
+    For offline work such as scoring stored transcripts; batch jobs cost about
+    half as much as individual requests and complete within 24 hours.
+
+    Parameters
+    ----------
+    items : list[tuple[list[Message], str]]
+        Conversations to answer, each as ``(history, prompt)`` like :func:`get_ai_response` takes
+
+    Returns
+    -------
+    str
+        Batch job id to pass to :func:`poll_batch`
+    """
+    if _CLIENT is None:
+        raise RuntimeError("Batch jobs need the openai package and OPENAI_API_KEY")
+
+    lines = [
+        json.dumps({
+            "custom_id": f"request-{i}",
+            "method": "POST",
+            "url": _BATCH_ENDPOINT,
+            "body": {
+                "model": MODEL,
+                "messages": _with_prompt(history, prompt),
+            },
+        })
+        for i, (history, prompt) in enumerate(items)
+    ]
+    payload = io.BytesIO("\n".join(lines).encode("utf-8"))
+
+    input_file = _CLIENT.files.create(file=("batch.jsonl", payload), purpose="batch")
+    batch = _CLIENT.batches.create(
+        input_file_id=input_file.id,
+        endpoint=_BATCH_ENDPOINT,
+        completion_window="24h",
+    )
+    return batch.id
+
+
+def poll_batch(job_id: str) -> list[str | None] | None:
+    """Return the responses of a finished batch job, or None while it is still running.
+
+    Parameters
+    ----------
+    job_id : str
+        Id returned by :func:`submit_batch`
+
+    Returns
+    -------
+    list[str | None] | None
+        Responses in submission order (None for individual requests that failed),
+        or None if the job has not completed yet
+    """
+    if _CLIENT is None:
+        raise RuntimeError("Batch jobs need the openai package and OPENAI_API_KEY")
+
+    batch = _CLIENT.batches.retrieve(job_id)
+    if batch.status in _BATCH_FAILED_STATUSES:
+        raise RuntimeError(f"Batch {job_id} ended with status {batch.status!r}")
+    if batch.status != "completed":
+        return None
+
+    results: dict[int, str] = {}
+    if batch.output_file_id:
+        for line in _CLIENT.files.content(batch.output_file_id).text.splitlines():
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                index = int(record["custom_id"].removeprefix("request-"))
+                results[index] = response["body"]["choices"][0]["message"]["content"]
+
+    # request_counts is optional in the API; fall back to the highest index seen
+    if batch.request_counts is not None:
+        total = batch.request_counts.total
+    else:
+        total = max(results) + 1 if results else 0
+    return [results.get(i) for i in range(total)]
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding() -> "tiktoken.Encoding | None":
+    """Return the tokenizer for MODEL, or None if tiktoken or its BPE file is unavailable."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # The BPE file is downloaded on first use, which fails when offline
+        return None
+
+
+def _approx_tokens(history: list[Message], prompt: str) -> int:
+    """Rough prompt size in tokens; falls back to ~4 characters per token without tiktoken."""
+    text = "".join(message["content"] for message in history) + prompt
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 4
+
+
+def _length_bucket(n_tokens: int) -> int:
+    """Exponential bucket index: 0 for up to 128 tokens, 1 for 129-256, 2 for 257-512, ..."""
+    return max(0, (max(n_tokens, 1) - 1).bit_length() - 7)
+
+
+class BatchedLLMClient:
+    """Collect chat requests from concurrent callers and dispatch them in batches.
+
+    Requests are flushed every ``max_batch_delay_ms`` or as soon as
+    ``max_batch_size`` are waiting, trading a few milliseconds of latency for
+    fewer, denser bursts of provider traffic under load. Every request is
+    still its own provider call, and each caller gets its response as soon as
+    that call returns. Each batch is grouped into buckets of similar prompt
+    length, sent shortest first. Against the OpenAI API that only orders the
+    sends, because latency depends mostly on output length. The grouping pays
+    off with a self-hosted backend that serves each bucket as one padded
+    batch. Create one per event loop, since its queue belongs to the loop it
+    first runs on.
+    """
+
+    def __init__(self, max_batch_size: int = 16, max_batch_delay_ms: float = 50) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_batch_delay_ms < 0:
+            raise ValueError("max_batch_delay_ms must be non-negative")
+
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay_ms / 1000
+        self._queue: asyncio.Queue | None = None
+        self._batch_full: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+        self._pending: list = []  # requests taken off the queue but not yet dispatched
+        self._in_flight: set[asyncio.Task] = set()
+        self._closed = False
+
+    async def submit(self, history: list[Message], prompt: str) -> str:
+        """Queue one request and wait for its response; same arguments as :func:`get_ai_response`."""
+        if _CLIENT is None:
+            raise RuntimeError("BatchedLLMClient needs the openai package and OPENAI_API_KEY")
+        if self._closed:
+            raise RuntimeError("BatchedLLMClient is closed")
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._batch_full = asyncio.Event()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._collect())
+
+        if _encoding.cache_info().currsize == 0:
+            # The first load may download the BPE file; keep it off the event loop
+            await asyncio.to_thread(_encoding)
+        # Bucketed here so a malformed request fails its own caller, not the collector
+        bucket = _length_bucket(_approx_tokens(history, prompt))
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((bucket, history, prompt, future))
+        if self._queue.qsize() >= self.max_batch_size - 1:
+            self._batch_full.set()
+        return await future
+
+    async def close(self) -> None:
+        """Stop collecting, fail requests not yet dispatched and wait for those already dispatched."""
+        self._closed = True
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        undispatched, self._pending = self._pending, []
+        while self._queue is not None and not self._queue.empty():
+            undispatched.append(self._queue.get_nowait())
+        for *_, future in undispatched:
+            if not future.done():
+                future.set_exception(RuntimeError("BatchedLLMClient is closed"))
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def _collect(self) -> None:
+        while True:
+            # Queue.get() is cancellation-safe, so close() can't lose a request here
+            self._pending = [await self._queue.get()]
+            if self._queue.qsize() < self.max_batch_size - 1:
+                # Wait on an event rather than wait_for(queue.get()), which can
+                # drop an item that arrives as the timeout fires
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.max_batch_delay)
+                except asyncio.TimeoutError:
+                    pass
+            self._batch_full.clear()
+
+            batch, self._pending = self._pending, []
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            buckets = defaultdict(list)
+            for request in batch:
+                buckets[request[0]].append(request)
+
+            # Dispatch in the background so the next batch keeps filling
+            for _, bucket in sorted(buckets.items()):
+                for request in bucket:
+                    self._dispatch(request)
+
+    def _dispatch(self, request: tuple) -> None:
+        _, history, prompt, future = request
+        task = asyncio.create_task(_acreate_response(history, prompt))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+        # Resolve this caller as soon as its own call finishes, not with the rest of the batch
+        task.add_done_callback(functools.partial(_settle, future))
+
+
+def _settle(future: asyncio.Future, task: asyncio.Task) -> None:
+    """Copy a finished request task's outcome onto its caller's future."""
+    if future.done():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
+_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BatchedLLMClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_batcher() -> BatchedLLMClient:
+    """Return the BatchedLLMClient for the running event loop, like :func:`_get_async_client`."""
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None:
+        batcher = _batchers[loop] = BatchedLLMClient()
+    return batcher